@@ -2,7 +2,7 @@
 """
 Astrology helpers using Swiss Ephemeris (pyswisseph).
 Provides ChartCalculator that computes planet positions, ascendant,
-rasi chart and navamsa chart.
+rasi chart and navamsa chart, plus compute_rasi_batch for many charts at once.
 """
 
 try:
@@ -17,8 +17,181 @@ except ModuleNotFoundError as e:
     ) from e
 
 from datetime import timezone
+from functools import lru_cache
 import math
 
+import numpy as np
+
+# (name, swisseph body code) pairs, resolved once at import
+_BODIES = tuple((name, getattr(swe, code)) for name, code in (
+    ('Sun', 'SUN'),
+    ('Moon', 'MOON'),
+    ('Mercury', 'MERCURY'),
+    ('Venus', 'VENUS'),
+    ('Mars', 'MARS'),
+    ('Jupiter', 'JUPITER'),
+    ('Saturn', 'SATURN'),
+    # use mean node for Rahu; you can switch to TRUE_NODE if preferred
+    ('Rahu', 'MEAN_NODE'),
+))
+
+def _probe_asc_extractor():
+    """
+    Detect the return shape of this pyswisseph build's swe.houses once, at import.
+    Modern builds return (cusps, ascmc) with ascmc[0] the Ascendant; older
+    wrappers returned other shapes. Returns an extractor or None.
+    """
+    try:
+        res = swe.houses(2451545.0, 0.0, 0.0, b'P')
+    except Exception:
+        return None
+    candidates = (
+        lambda r: r[1][0],  # (cusps, ascmc) -> ascmc[0]
+        lambda r: r[0][0],  # (ascmc, cusps) or cusps-first -> first value
+        lambda r: r[0],     # flat sequence with asc first
+    )
+    for extract in candidates:
+        try:
+            float(extract(res))
+            return extract
+        except Exception:
+            continue
+    return None
+
+_ASC_EXTRACT = _probe_asc_extractor()
+
+# ayanamsa label -> swisseph sidereal mode attribute; unknown labels use Lahiri
+_SID_MODES = {
+    'Lahiri': 'SIDM_LAHIRI',
+    'Raman': 'SIDM_RAMAN',
+    'Fagan-Allen': 'SIDM_FAGAN_BRADLEY',
+}
+_current_sid_mode = None
+
+def _set_sid_mode(ayanamsa):
+    """Set the swisseph sidereal mode for `ayanamsa`, skipping the call if already active."""
+    global _current_sid_mode
+    mode = getattr(swe, _SID_MODES.get(ayanamsa, 'SIDM_LAHIRI'), None)
+    if mode is None or mode == _current_sid_mode:
+        return
+    try:
+        swe.set_sid_mode(mode)
+        _current_sid_mode = mode
+    except Exception:
+        # Not fatal: if attribute missing in some wrappers, continue.
+        pass
+
+# Set sidereal mode to Lahiri by default, once at import
+_set_sid_mode('Lahiri')
+
+# rounding applied to cache keys: 1e-6 day (~86 ms) and 1e-4 degree (~11 m)
+_JD_DIGITS = 6
+_LATLON_DIGITS = 4
+
+def _body_longitude(jd, code):
+    """Longitude (0-360) of a single body; 0.0 if swisseph fails."""
+    # pyswisseph returns ((lon, lat, dist, ...), retflag)
+    try:
+        return swe.calc_ut(jd, code)[0][0] % 360.0
+    except Exception:
+        return 0.0
+
+def _planet_longitudes(jd):
+    """Return a tuple of (name, longitude 0-360) for every body in _BODIES."""
+    return tuple((name, _body_longitude(jd, code)) for name, code in _BODIES)
+
+def _ascendant_at(jd, lat, lon):
+    """Ascendant (0-360) for the given Julian Day and location; 0.0 if it cannot be computed."""
+    if _ASC_EXTRACT is None:
+        return 0.0
+    try:
+        return float(_ASC_EXTRACT(swe.houses(jd, lat, lon))) % 360.0
+    except Exception:
+        # e.g. Placidus is undefined at polar latitudes; ultimate fallback
+        return 0.0
+
+# strength-reduced divisors for the kernel: sign = lon / 30, navamsa = deg / (30/9)
+_INV_30 = 1.0 / 30.0
+_INV_NAV = 9.0 / 30.0
+
+def _rasi_nav_kernel(lons):
+    """
+    Elementwise rasi/navamsa arithmetic on an array of longitudes (0-360), any shape.
+    Returns (rasi 1..12, degree_in_sign, nav_sign 1..12); rasi/nav_sign are int64.
+    """
+    # lons are clamped to [0, 360) upstream, so truncation equals floor
+    sign_index = (lons * _INV_30).astype(np.int64)
+    deg = lons - sign_index * 30.0
+    nav_index = (deg * _INV_NAV).astype(np.int64)
+    nav_sign = (sign_index * 9 + nav_index) % 12 + 1
+    return sign_index + 1, deg, nav_sign
+
+@lru_cache(maxsize=1)
+def _batch_kernel():
+    """
+    _rasi_nav_kernel JIT-compiled with numba for compute_rasi_batch, if numba is installed.
+    Single charts (8 bodies) use the plain NumPy kernel: there the numba import and
+    compile time dwarf the arithmetic.
+    """
+    try:
+        from numba import njit
+    except Exception:
+        return _rasi_nav_kernel
+    return njit(cache=True)(_rasi_nav_kernel)
+
+@lru_cache(maxsize=256)
+def _compute_rasi(jd, lat, lon, ayanamsa):
+    """
+    Pure rasi computation for (already rounded) inputs.
+    Returns ((name, lon, rasi, degree_in_sign), ...) and the ascendant.
+    ayanamsa is part of the key so charts for different sidereal modes never collide.
+    """
+    bodies = _planet_longitudes(jd)
+    asc = _ascendant_at(jd, lat, lon)
+    lons = np.fromiter((plon for _, plon in bodies), dtype=np.float64, count=len(bodies))
+    rasi, deg_in_sign, _ = _rasi_nav_kernel(lons)
+    # tolist() gives back plain ints/floats so the chart stays JSON-serializable
+    planets = tuple(
+        (name, plon, r, d)
+        for (name, _), plon, r, d in zip(bodies, lons.tolist(), rasi.tolist(), deg_in_sign.tolist())
+    )
+    return planets, asc
+
+def compute_rasi_batch(jds, lats, lons):
+    """
+    Compute rasi/navamsa data for many charts at once, in structure-of-arrays form.
+    jds: 1-D array of Julian Days (UT); lats, lons: arrays of the same length (or scalars)
+    used for the ascendant.
+    Returns a dict of numpy arrays, one row per body in 'names' order:
+      'names'          tuple of body names (row order)
+      'lon'            (N_planets, N_times) float64 longitudes 0-360
+      'rasi'           (N_planets, N_times) int8 signs 1..12
+      'degree_in_sign' (N_planets, N_times) float64
+      'nav_sign'       (N_planets, N_times) int8 navamsa signs 1..12
+      'asc'            (N_times,) float64 ascendants
+    pyswisseph has no array API, so bodies are looped outside and times inside;
+    everything downstream of the ephemeris calls is vectorized.
+    """
+    jds = np.asarray(jds, dtype=np.float64).ravel()
+    lats = np.broadcast_to(np.asarray(lats, dtype=np.float64), jds.shape)
+    lons = np.broadcast_to(np.asarray(lons, dtype=np.float64), jds.shape)
+
+    lon = np.empty((len(_BODIES), jds.size), dtype=np.float64)
+    for i, (_, code) in enumerate(_BODIES):
+        lon[i] = [_body_longitude(jd, code) for jd in jds]
+    asc = np.array([_ascendant_at(jd, la, lo) for jd, la, lo in zip(jds, lats, lons)],
+                   dtype=np.float64)
+
+    rasi, deg_in_sign, nav_sign = _batch_kernel()(lon)
+    return {
+        'names': tuple(name for name, _ in _BODIES),
+        'lon': lon,
+        'rasi': rasi.astype(np.int8),
+        'degree_in_sign': deg_in_sign,
+        'nav_sign': nav_sign.astype(np.int8),
+        'asc': asc,
+    }
+
 class ChartCalculator:
     def __init__(self, dt, lat, lon, tz_name, ayanamsa='Lahiri', house_system='Placidus'):
         """
@@ -32,20 +205,22 @@ class ChartCalculator:
         self.tz_name = tz_name
         self.ayanamsa = ayanamsa
         self.house_system = house_system
+        # cached Julian Day; dt/lat/lon are fixed at construction
+        self._jd = None
 
-        # Set sidereal mode to Lahiri by default (customize if needed)
-        try:
-            swe.set_sid_mode(swe.SIDM_LAHIRI)
-        except Exception:
-            # Not fatal: if attribute missing in some wrappers, continue.
-            pass
+        # Sidereal mode is process-global in swisseph; only touch it when it changes
+        _set_sid_mode(ayanamsa)
 
     def _julian_day(self):
         """
         Compute Julian Day (UT) using swisseph API:
         swe.julday(year, month, day, hour_decimal)
         We convert self.dt to UTC and supply integer year/month/day and fractional hour.
+        The result is computed once and cached on the instance.
         """
+        if self._jd is not None:
+            return self._jd
+
         # ensure dt is timezone-aware; convert to UTC
         if self.dt.tzinfo is None:
             # best-effort: assume dt is already UTC-like — but it's safer to pass tz-aware datetime
@@ -66,117 +241,58 @@ class ChartCalculator:
         )
 
         # Call julday with separate hour parameter to avoid passing float day
-        jd = swe.julday(year, month, day, hour_decimal)
-        return jd
+        self._jd = swe.julday(year, month, day, hour_decimal)
+        return self._jd
 
     def planet_positions(self):
         """
         Return dictionary of planet longitudes (0-360) and raw info.
         """
-        jd = self._julian_day()
-        bodies = {
-            'Sun': swe.SUN,
-            'Moon': swe.MOON,
-            'Mercury': swe.MERCURY,
-            'Venus': swe.VENUS,
-            'Mars': swe.MARS,
-            'Jupiter': swe.JUPITER,
-            'Saturn': swe.SATURN,
-            # use mean node for Rahu; you can switch to TRUE_NODE if preferred
-            'Rahu': swe.MEAN_NODE,
-        }
-        planets = {}
-        for name, code in bodies.items():
-            # calc_ut returns (longitude, latitude, distance) in many wrappers
-            res = swe.calc_ut(jd, code)
-            # res may be list, tuple or nested; handle common shapes
-            # pyswisseph usually returns a tuple of arrays: (lon, lat, dist), but APIs vary by version
-            try:
-                lon = float(res[0])
-            except Exception:
-                # fallback if returned as nested structure
-                try:
-                    lon = float(res[0][0])
-                except Exception:
-                    lon = 0.0
-            lon = lon % 360.0
-            planets[name] = {'lon': lon}
-        return planets
+        return {name: {'lon': lon} for name, lon in _planet_longitudes(self._julian_day())}
 
     def ascendant(self):
         """
-        Compute Ascendant (Lagna) using swe.houses or swe.houses_ex depending on wrapper.
-        We'll first try swe.houses(jd, lat, lon) which commonly returns (ascmc, houses)
+        Compute Ascendant (Lagna) using swe.houses(jd, lat, lon).
+        The return shape is detected once at import (see _ASC_EXTRACT).
         """
-        jd = self._julian_day()
-        # try the common API
-        try:
-            ascmc = swe.houses(jd, self.lat, self.lon)
-            # many bindings return a tuple: (cusps, ascmc) or (ascmc, cusps) depending on version;
-            # attempt to extract the ascendant robustly:
-            if isinstance(ascmc, tuple) and len(ascmc) >= 2:
-                # look for a numeric asc value among returned structures
-                for part in ascmc:
-                    if isinstance(part, (list, tuple)):
-                        # find a float-looking item
-                        for item in part:
-                            if isinstance(item, (int, float)):
-                                asc = float(item)
-                                return asc % 360.0
-                # fallback: use first element's first numeric
-                try:
-                    asc = float(ascmc[0][0])
-                    return asc % 360.0
-                except Exception:
-                    pass
-            # If houses returned a single array with asc as first element
-            if isinstance(ascmc, (list, tuple)) and len(ascmc) >= 1 and isinstance(ascmc[0], (int, float)):
-                return float(ascmc[0]) % 360.0
-        except Exception:
-            pass
-
-        # fallback: use swe.houses_ex if available
-        try:
-            ascmc = swe.houses_ex(jd, self.lat, self.lon)
-            # typical structure: (cusps, ascmc)
-            # try to get asc from ascmc[0]
-            if isinstance(ascmc, tuple) and len(ascmc) >= 2:
-                asc = ascmc[0][0] if isinstance(ascmc[0], (list, tuple)) else ascmc[0]
-                return float(asc) % 360.0
-        except Exception:
-            pass
-
-        # As an ultimate fallback, return 0.0
-        return 0.0
+        return _ascendant_at(self._julian_day(), self.lat, self.lon)
 
     def get_rasi_chart(self):
         """
         Build rasi chart structure with each planet's rasi (1..12) and degree within sign.
+        Results are served from an LRU cache keyed on rounded inputs (see _compute_rasi),
+        so nudging time/location by tiny amounts reuses the previous computation.
         """
-        planets = self.planet_positions()
-        asc = self.ascendant()
-        for p, info in planets.items():
-            lon = info.get('lon', 0.0)
-            rasi = int(lon // 30) + 1
-            deg_in_sign = lon % 30
-            info.update({'rasi': rasi, 'degree_in_sign': deg_in_sign})
+        planets_t, asc = _compute_rasi(
+            round(self._julian_day(), _JD_DIGITS),
+            round(self.lat, _LATLON_DIGITS),
+            round(self.lon, _LATLON_DIGITS),
+            self.ayanamsa,
+        )
+        # fresh dicts per call: callers are free to mutate the chart
+        planets = {
+            name: {'lon': lon, 'rasi': r, 'degree_in_sign': d}
+            for name, lon, r, d in planets_t
+        }
         return {'planets': planets, 'asc': asc}
 
-    def get_navamsa_chart(self):
+    def get_navamsa_chart(self, rasi=None):
         """
         Compute navamsa sign for each planet. Basic algorithm:
         - navamsa index within a sign = floor((degree_in_sign) / (30/9))
         - convert to absolute navamsa sign by (sign_index-1)*9 + nav_index then map mod 12 +1
+        rasi: optional output of get_rasi_chart() to avoid recomputing it.
         """
-        rasi = self.get_rasi_chart()
-        nav = {}
-        for p, info in rasi['planets'].items():
-            lon = info.get('lon', 0.0)
-            # navamsa partition size:
-            part = 30.0 / 9.0
-            nav_index = int((lon % 30) // part)
-            nav_sign = ((int(lon // 30) * 9) + nav_index) % 12 + 1
-            nav[p] = {'lon': lon, 'nav_sign': nav_sign}
+        if rasi is None:
+            rasi = self.get_rasi_chart()
+        planets = rasi['planets']
+        lons = np.fromiter((info.get('lon', 0.0) for info in planets.values()),
+                           dtype=np.float64, count=len(planets))
+        _, _, nav_sign = _rasi_nav_kernel(lons)
+        nav = {
+            p: {'lon': lon, 'nav_sign': ns}
+            for p, lon, ns in zip(planets, lons.tolist(), nav_sign.tolist())
+        }
         return {'navamsa': nav}
 
     def metadata(self):
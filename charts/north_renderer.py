@@ -3,9 +3,11 @@
 Clean, robust North-Indian rasi chart renderer.
 Replaces previous buggy code that referenced an undefined `s`.
 Returns a legible SVG string (use st.components.v1.html(svg, height=...)).
+SVG is emitted directly as f-string fragments (no svgwrite DOM).
 """
 
-import svgwrite
+from functools import lru_cache
+from xml.sax.saxutils import escape
 from typing import Dict
 
 # Unicode zodiac glyphs Aries..Pisces
@@ -29,13 +31,18 @@ PLANET_COLORS = {
     "Rahu": "#7F7F7F",
     "Ketu": "#2B2B2B"
 }
+# frozen (name, color) pairs for the legend
+_LEGEND = tuple(PLANET_COLORS.items())
 
 def _deg_min_str(deg_float: float) -> str:
-    d = int(deg_float)
-    m = int(round((deg_float - d) * 60))
-    return f"{d}°{m:02d}'"
+    # whole minutes, rounded half-up; divmod carries 59.5' into the next degree
+    d, m = divmod(int(deg_float * 60 + 0.5), 60)
+    return f"{d}\u00B0{m:02d}'"
 
 def _wrap_lines(text: str, max_chars: int = 16):
+    # fast path: most labels ("Saturn 12°34'") fit on one line
+    if 0 < len(text) <= max_chars:
+        return [text]
     words = text.split()
     lines = []
     cur = ""
@@ -49,30 +56,17 @@ def _wrap_lines(text: str, max_chars: int = 16):
         lines.append(cur)
     return lines
 
-def draw_north_chart_svg(rasi_obj: Dict,
-                         size: int = 900,
-                         bg_color: str = "#ffffff",
-                         stroke_color: str = "#222222",
-                         text_color: str = "#111111",
-                         font_family: str = "Segoe UI, Roboto, Arial, Helvetica, sans-serif",
-                         show_degrees: bool = True,
-                         title: str = None) -> str:
+@lru_cache(maxsize=8)
+def _north_layout(size: int, has_title: bool):
     """
-    rasi_obj: {'planets': {'Sun': {'lon':..,'rasi':..,'degree_in_sign':..},...}, 'asc': <deg>}
-    size: canvas size in px
-    Returns SVG string.
+    Grid geometry for a given canvas size. Pure function of (size, has_title),
+    cached so per-render work is limited to planet placement.
+    Returns (margin, title_h, grid_y0, grid_h, ordered_layout, house_w, house_h, font_base).
     """
-    dwg = svgwrite.Drawing(size=(size, size))
-    dwg.viewbox(0, 0, size, size)
-    dwg.add(dwg.rect((0,0),(size,size), fill=bg_color))
-
     margin = int(size * 0.06)
     inner_w = size - 2*margin
     inner_h = size - 2*margin
-    title_h = int(size * 0.06) if title else 0
-    if title:
-        dwg.add(dwg.text(title, insert=(margin + 10, margin + int(title_h*0.6)),
-                         font_size=int(size*0.03), font_family=font_family, fill=text_color, font_weight="700"))
+    title_h = int(size * 0.06) if has_title else 0
 
     grid_y0 = margin + title_h + 6
     grid_w = inner_w
@@ -86,7 +80,7 @@ def draw_north_chart_svg(rasi_obj: Dict,
 
     # Use a canonical ordered layout (12 houses). Each entry: (sign_index, x, y)
     # These coordinates are chosen to give a classic north-chart look while staying simple.
-    ordered_layout = [
+    ordered_layout = tuple((sign, float(x), float(y)) for sign, x, y in [
         (1, margin + cell_w, grid_y0 + 0*cell_h),      # Aries (top-center)
         (2, margin + 2*cell_w, grid_y0 + 0*cell_h),    # Taurus (top-right)
         (3, margin + 2*cell_w, grid_y0 + 0.5*cell_h),  # Gemini (upper-right inner)
@@ -99,41 +93,111 @@ def draw_north_chart_svg(rasi_obj: Dict,
         (10, margin + 0*cell_w, grid_y0 + 0*cell_h),   # Capricorn (top-left)
         (11, margin + cell_w * 1.02, grid_y0 + 0.5*cell_h),  # Aquarius (mid-right-ish)
         (12, margin + cell_w * 1.02, grid_y0 + 1.5*cell_h),  # Pisces (mid-left-ish)
-    ]
+    ])
 
     house_w = int(cell_w * 0.94)
     house_h = int(cell_h * 0.9)
     font_base = max(12, int(size * 0.014))
+    return margin, title_h, grid_y0, grid_h, ordered_layout, house_w, house_h, font_base
+
+@lru_cache(maxsize=8)
+def _north_layout_by_sign(size: int, has_title: bool):
+    """House (x, y) indexed by sign number (index 0 unused), for O(1) lookups."""
+    ordered_layout = _north_layout(size, has_title)[4]
+    layout_by_sign = [None] * 13
+    for sign, x, y in ordered_layout:
+        layout_by_sign[sign] = (x, y)
+    return tuple(layout_by_sign)
+
+@lru_cache(maxsize=16)
+def _build_static_skeleton(size: int,
+                           bg_color: str,
+                           stroke_color: str,
+                           title: str):
+    """
+    Pre-serialized SVG elements that do not depend on planet positions:
+    background, title, house boxes with glyph headers (head) and the legend (tail).
+    Cached so Streamlit reruns only rebuild planets and the ASC badge.
+    """
+    margin, title_h, grid_y0, grid_h, ordered_layout, house_w, house_h, font_base = _north_layout(size, bool(title))
+    # loop-invariant font sizes / offsets
+    fs_glyph = int(font_base*1.2)
+    fs_name = int(font_base*1.0)
+    name_dx = int(font_base*1.6)
+    fs_legend_title = int(font_base*0.9)
+    fs_legend = int(font_base*0.85)
+
+    head = [f'<rect x="0" y="0" width="{size}" height="{size}" fill="{bg_color}"/>']
+    if title:
+        head.append(f'<text x="{margin + 10}" y="{margin + int(title_h*0.6)}" font-size="{int(size*0.03)}" font-weight="700">{escape(title)}</text>')
 
     # Draw boxes and headers
     for sign, x, y in ordered_layout:
-        x = float(x)
-        y = float(y)
-        dwg.add(dwg.rect(insert=(x, y), size=(house_w, house_h),
-                         stroke=stroke_color, stroke_width=1.6, fill="none"))
+        head.append(f'<rect x="{x}" y="{y}" width="{house_w}" height="{house_h}" '
+                    f'stroke="{stroke_color}" stroke-width="1.6" fill="none"/>')
         glyph = ZODIAC_GLYPHS[sign-1]
         header_x = x + 8
         header_y = y + font_base + 4
-        dwg.add(dwg.text(glyph, insert=(header_x, header_y),
-                         font_size=int(font_base*1.2), font_family=font_family, fill=text_color))
-        dwg.add(dwg.text(SIGN_NAMES[sign-1], insert=(header_x + int(font_base*1.6), header_y),
-                         font_size=int(font_base*1.0), font_family=font_family, fill=text_color, font_weight="700"))
+        head.append(f'<text x="{header_x}" y="{header_y}" font-size="{fs_glyph}">{glyph}</text>')
+        head.append(f'<text x="{header_x + name_dx}" y="{header_y}" font-size="{fs_name}" font-weight="700">{SIGN_NAMES[sign-1]}</text>')
+
+    # Optional legend
+    legend_y = grid_y0 + grid_h + 6
+    tail = [f'<text x="{margin+6}" y="{legend_y + 12}" font-size="{fs_legend_title}" font-weight="700">Legend:</text>']
+    lx = margin + 74
+    for i,(pn,color) in enumerate(_LEGEND):
+        tail.append(f'<circle cx="{lx + i*78}" cy="{legend_y + 8}" r="4" fill="{color}"/>')
+        tail.append(f'<text x="{lx + 10 + i*78}" y="{legend_y + 12}" font-size="{fs_legend}">{pn}</text>')
+
+    return "".join(head), "".join(tail)
+
+def draw_north_chart_svg(rasi_obj: Dict,
+                         size: int = 900,
+                         bg_color: str = "#ffffff",
+                         stroke_color: str = "#222222",
+                         text_color: str = "#111111",
+                         font_family: str = "Segoe UI, Roboto, Arial, Helvetica, sans-serif",
+                         show_degrees: bool = True,
+                         title: str = None) -> str:
+    """
+    rasi_obj: {'planets': {'Sun': {'lon':..,'rasi':..,'degree_in_sign':..},...}, 'asc': <deg>}
+    size: canvas size in px
+    Returns SVG string.
+    """
+    head, tail = _build_static_skeleton(size, bg_color, stroke_color, title)
+    margin, title_h, grid_y0, grid_h, ordered_layout, house_w, house_h, font_base = _north_layout(size, bool(title))
+    font_family = escape(font_family, {'"': "&quot;"})
+    # loop-invariant font sizes / offsets
+    fs_label = int(font_base*0.95)
+    fs_asc = int(font_base*0.8)
+    label_dy = int(font_base*0.6)
+    line_h = int(font_base*1.05)
+    row_h = int(font_base*1.3)
+    planets_dy = int(font_base*1.9) + 6
+    dot_r = max(3, int(size*0.0035))
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size}" height="{size}">',
+             # text elements inherit font and color from this group
+             f'<g font-family="{font_family}" fill="{text_color}">',
+             head]
 
     # Map planets to signs
     planets = rasi_obj.get("planets", {})
-    sign_to_planets = {i: [] for i in range(1,13)}
+    # index 0 unused so signs 1..12 index directly
+    sign_to_planets = [[] for _ in range(13)]
     for p, info in planets.items():
         lon = info.get("lon", 0)
         r = info.get("rasi") or int(lon // 30) + 1
         deg = info.get("degree_in_sign") or (lon % 30)
         sign_to_planets[r].append((p, deg))
 
-    # Place planets inside houses (two-column layout)
+    # Place planets inside houses (two-column layout); all labels of a house share
+    # one <text> element with absolutely positioned <tspan> lines
     for sign, x, y in ordered_layout:
-        x = float(x)
-        y = float(y)
-        items = sign_to_planets.get(sign, [])
-        start_y = y + int(font_base*1.9) + 6
+        items = sign_to_planets[sign]
+        if not items:
+            continue
+        spans = []
+        start_y = y + planets_dy
         left_x = x + 8
         right_x = x + int(house_w/2) + 6
         left = True
@@ -141,39 +205,38 @@ def draw_north_chart_svg(rasi_obj: Dict,
         for (p, deg) in items:
             label = f"{p}" + (f" {_deg_min_str(deg)}" if show_degrees else "")
             lines = _wrap_lines(label, max_chars=18)
-            dot_r = max(3, int(size*0.0035))
             col_x = left_x if left else right_x
             # dot
-            dwg.add(dwg.circle(center=(col_x, line_y + 2), r=dot_r, fill=PLANET_COLORS.get(p, "#333333")))
+            parts.append(f'<circle cx="{col_x}" cy="{line_y + 2}" r="{dot_r}" fill="{PLANET_COLORS.get(p, "#333333")}"/>')
             for li, line in enumerate(lines):
-                dwg.add(dwg.text(line, insert=(col_x + dot_r + 6, line_y + int(font_base*0.6) + li*int(font_base*1.05)),
-                                 font_size=int(font_base*0.95), font_family=font_family, fill=text_color))
+                spans.append(f'<tspan x="{col_x + dot_r + 6}" y="{line_y + label_dy + li*line_h}">{line}</tspan>')
             if left:
                 left = False
             else:
                 left = True
-                line_y += int(font_base*1.3) * max(1, len(lines))
+                line_y += row_h * max(1, len(lines))
+        parts.append(f'<text font-size="{fs_label}">'
+                     + "".join(spans) + '</text>')
 
     # ASC marker
     asc = rasi_obj.get("asc")
     if asc is not None:
         asc_sign = int((asc // 30) % 12) + 1
-        for sign, x, y in ordered_layout:
-            if sign == asc_sign:
-                badge_r = int(min(house_w, house_h) * 0.07)
-                cx = x + house_w - (badge_r + 10)
-                cy = y + (badge_r + 10)
-                dwg.add(dwg.circle(center=(cx, cy), r=badge_r, fill="#111111", stroke="#ffffff", stroke_width=1.2))
-                dwg.add(dwg.text("ASC", insert=(cx - badge_r*0.7, cy + int(badge_r*0.28)),
-                                 font_size=int(font_base*0.8), font_family=font_family, fill="#fff", font_weight="700"))
-                break
-
-    # Optional legend
-    legend_y = grid_y0 + grid_h + 6
-    dwg.add(dwg.text("Legend:", insert=(margin+6, legend_y + 12), font_size=int(font_base*0.9), font_family=font_family, fill=text_color, font_weight="700"))
-    lx = margin + 74
-    for i,(pn,color) in enumerate(PLANET_COLORS.items()):
-        dwg.add(dwg.circle(center=(lx + i*78, legend_y + 8), r=4, fill=color))
-        dwg.add(dwg.text(pn, insert=(lx + 10 + i*78, legend_y + 12), font_size=int(font_base*0.85), font_family=font_family, fill=text_color))
-
-    return dwg.tostring()
+        x, y = _north_layout_by_sign(size, bool(title))[asc_sign]
+        badge_r = int(min(house_w, house_h) * 0.07)
+        cx = x + house_w - (badge_r + 10)
+        cy = y + (badge_r + 10)
+        parts.append(f'<circle cx="{cx}" cy="{cy}" r="{badge_r}" fill="#111111" stroke="#ffffff" stroke-width="1.2"/>')
+        parts.append(f'<text x="{cx - badge_r*0.7}" y="{cy + int(badge_r*0.28)}" font-size="{fs_asc}" '
+                     f'fill="#fff" font-weight="700">ASC</text>')
+
+    parts.append(tail)
+    parts.append("</g></svg>")
+    return "".join(parts)
+
+def draw_north_chart_svg_bytes(rasi_obj: Dict, **kwargs) -> bytes:
+    """
+    Same as draw_north_chart_svg but returns UTF-8 encoded bytes, for callers that
+    serve or write the SVG directly. kwargs are passed through unchanged.
+    """
+    return draw_north_chart_svg(rasi_obj, **kwargs).encode("utf-8")
@@ -4,9 +4,11 @@ Improved South-Indian rasi chart renderer.
 - Produces high-contrast, legible SVG tuned for Streamlit.
 - Shows zodiac glyphs, colored planet dots, two-column planet layout.
 - Usage: draw_south_chart_svg(rasi_obj, size=900)
+- SVG is emitted directly as f-string fragments (no svgwrite DOM).
 """
 
-import svgwrite
+from functools import lru_cache
+from xml.sax.saxutils import escape
 from typing import Dict, Tuple
 
 # Unicode zodiac glyphs mapped to sign index 1..12 (Aries..Pisces)
@@ -31,13 +33,18 @@ PLANET_COLORS = {
     "Rahu": "#7F7F7F",
     "Ketu": "#2B2B2B"
 }
+# frozen (name, color) pairs for the legend
+_LEGEND = tuple(PLANET_COLORS.items())
 
 def _deg_min_str(deg_float: float) -> str:
-    d = int(deg_float)
-    m = int(round((deg_float - d) * 60))
-    return f"{d}°{m:02d}'"
+    # whole minutes, rounded half-up; divmod carries 59.5' into the next degree
+    d, m = divmod(int(deg_float * 60 + 0.5), 60)
+    return f"{d}\u00B0{m:02d}'"
 
 def _wrap_lines(text: str, max_chars: int = 18):
+    # fast path: most labels ("Saturn 12°34'") fit on one line
+    if 0 < len(text) <= max_chars:
+        return [text]
     words = text.split()
     lines = []
     cur = ""
@@ -56,39 +63,20 @@ def _planet_label_lines(name: str, deg: float, show_deg: bool = True) -> Tuple[s
         return (f"{name} {_deg_min_str(deg)}",)
     return (name,)
 
-def draw_south_chart_svg(rasi_obj: Dict,
-                         size: int = 900,
-                         bg_color: str = "#ffffff",
-                         card_margin: int = 30,
-                         stroke_color: str = "#222222",
-                         text_color: str = "#111111",
-                         font_family: str = "Segoe UI, Roboto, Arial, Helvetica, sans-serif",
-                         show_degrees: bool = True,
-                         title: str = None) -> str:
+@lru_cache(maxsize=8)
+def _south_layout(size: int, card_margin: int, has_title: bool):
     """
-    rasi_obj: {'planets': {'Sun': {'lon':..,'rasi':..,'degree_in_sign':..},...}, 'asc': <deg>}
-    size: pixel width & height of SVG
+    Grid geometry for a given canvas size. Pure function of (size, card_margin, has_title),
+    cached so per-render work is limited to planet placement.
+    Returns (margin, title_h, grid_y0, grid_w, grid_h, cell_w, cell_h, sign_layout, font_base).
     """
-    dwg = svgwrite.Drawing(size=(size, size))
-    dwg.viewbox(0, 0, size, size)
-
-    # background card to stand out on dark theme
-    dwg.add(dwg.rect((0,0),(size,size), fill=bg_color))
-
     # card inner area
     margin = card_margin
     inner_w = size - 2*margin
     inner_h = size - 2*margin
 
     # title area (optional)
-    title_h = int(size * 0.06) if title else 0
-    if title:
-        dwg.add(dwg.text(title,
-                         insert=(margin + 12, margin + int(title_h*0.6)),
-                         font_size=int(size*0.03),
-                         font_family=font_family,
-                         fill=text_color,
-                         font_weight="700"))
+    title_h = int(size * 0.06) if has_title else 0
 
     grid_y0 = margin + title_h + 6
     grid_w = inner_w
@@ -100,7 +88,7 @@ def draw_south_chart_svg(rasi_obj: Dict,
     cell_h = grid_h / rows
 
     # Preferred sign layout for South Indian style (classical mapping)
-    sign_layout = [
+    sign_layout = (
         (1, margin + 3*cell_w, grid_y0 + 0*cell_h),
         (2, margin + 2*cell_w, grid_y0 + 0*cell_h),
         (3, margin + 1*cell_w, grid_y0 + 0*cell_h),
@@ -113,34 +101,111 @@ def draw_south_chart_svg(rasi_obj: Dict,
         (10, margin + 3*cell_w, grid_y0 + 1*cell_h),
         (11, margin + 2*cell_w, grid_y0 + 1*cell_h),
         (12, margin + 1*cell_w, grid_y0 + 1*cell_h),
-    ]
-
-    # panel background and border (rounded)
-    dwg.add(dwg.rect((margin-6, grid_y0-6), (grid_w+12, grid_h+12),
-                     rx=6, ry=6, fill="#fff", stroke=stroke_color, stroke_width=2))
+    )
 
     font_base = max(12, int(size * 0.014))
+    return margin, title_h, grid_y0, grid_w, grid_h, cell_w, cell_h, sign_layout, font_base
+
+@lru_cache(maxsize=8)
+def _south_layout_by_sign(size: int, card_margin: int, has_title: bool):
+    """Cell (x, y) indexed by sign number (index 0 unused), for O(1) lookups."""
+    sign_layout = _south_layout(size, card_margin, has_title)[7]
+    layout_by_sign = [None] * 13
+    for sign, sx, sy in sign_layout:
+        layout_by_sign[sign] = (sx, sy)
+    return tuple(layout_by_sign)
+
+@lru_cache(maxsize=16)
+def _build_static_skeleton(size: int,
+                           bg_color: str,
+                           card_margin: int,
+                           stroke_color: str,
+                           title: str):
+    """
+    Pre-serialized SVG elements that do not depend on planet positions:
+    background card, title, panel, sign cells with glyph headers (head) and the legend (tail).
+    Cached so Streamlit reruns only rebuild planets and the ASC badge.
+    """
+    margin, title_h, grid_y0, grid_w, grid_h, cell_w, cell_h, sign_layout, font_base = \
+        _south_layout(size, card_margin, bool(title))
+    # loop-invariant font sizes / offsets
+    fs_glyph = int(font_base*1.2)
+    fs_name = int(font_base*1.05)
+    name_dx = int(font_base*1.6)
+    fs_legend_title = int(font_base*0.9)
+    fs_legend = int(font_base*0.85)
+
+    # background card to stand out on dark theme
+    head = [f'<rect x="0" y="0" width="{size}" height="{size}" fill="{bg_color}"/>']
+
+    if title:
+        head.append(f'<text x="{margin + 12}" y="{margin + int(title_h*0.6)}" '
+                    f'font-size="{int(size*0.03)}" '
+                    f'font-weight="700">{escape(title)}</text>')
+
+    # panel background and border (rounded)
+    head.append(f'<rect x="{margin-6}" y="{grid_y0-6}" width="{grid_w+12}" height="{grid_h+12}" '
+                f'rx="6" ry="6" fill="#fff" stroke="{stroke_color}" stroke-width="2"/>')
 
     # Draw cells
     for sign, sx, sy in sign_layout:
-        dwg.add(dwg.rect(insert=(sx, sy), size=(cell_w, cell_h),
-                         stroke=stroke_color, stroke_width=1.6, fill="none"))
+        head.append(f'<rect x="{sx}" y="{sy}" width="{cell_w}" height="{cell_h}" '
+                    f'stroke="{stroke_color}" stroke-width="1.6" fill="none"/>')
 
         # header row: glyph + name
         glyph = ZODIAC_GLYPHS[sign-1]
         header_x = sx + 8
         header_y = sy + font_base + 4
         # glyph
-        dwg.add(dwg.text(glyph, insert=(header_x, header_y),
-                         font_size=int(font_base*1.2), font_family=font_family, fill=text_color))
+        head.append(f'<text x="{header_x}" y="{header_y}" font-size="{fs_glyph}">{glyph}</text>')
         # sign name (to the right)
-        dwg.add(dwg.text(SIGN_NAMES[sign-1],
-                         insert=(header_x + int(font_base*1.6), header_y),
-                         font_size=int(font_base*1.05), font_family=font_family, fill=text_color, font_weight="700"))
+        head.append(f'<text x="{header_x + name_dx}" y="{header_y}" font-size="{fs_name}" font-weight="700">{SIGN_NAMES[sign-1]}</text>')
+
+    # optional footer legend (small)
+    legend_y = grid_y0 + grid_h + 6
+    tail = [f'<text x="{margin+6}" y="{legend_y + 12}" font-size="{fs_legend_title}" font-weight="700">Legend:</text>']
+    lx = margin + 74
+    for i,(pn,color) in enumerate(_LEGEND):
+        # small dot + short label
+        tail.append(f'<circle cx="{lx + i*80}" cy="{legend_y + 8}" r="4" fill="{color}"/>')
+        tail.append(f'<text x="{lx + 10 + i*80}" y="{legend_y + 12}" font-size="{fs_legend}">{pn}</text>')
+
+    return "".join(head), "".join(tail)
+
+def draw_south_chart_svg(rasi_obj: Dict,
+                         size: int = 900,
+                         bg_color: str = "#ffffff",
+                         card_margin: int = 30,
+                         stroke_color: str = "#222222",
+                         text_color: str = "#111111",
+                         font_family: str = "Segoe UI, Roboto, Arial, Helvetica, sans-serif",
+                         show_degrees: bool = True,
+                         title: str = None) -> str:
+    """
+    rasi_obj: {'planets': {'Sun': {'lon':..,'rasi':..,'degree_in_sign':..},...}, 'asc': <deg>}
+    size: pixel width & height of SVG
+    """
+    head, tail = _build_static_skeleton(size, bg_color, card_margin, stroke_color, title)
+    margin, title_h, grid_y0, grid_w, grid_h, cell_w, cell_h, sign_layout, font_base = \
+        _south_layout(size, card_margin, bool(title))
+    font_family = escape(font_family, {'"': "&quot;"})
+    # loop-invariant font sizes / offsets
+    fs_label = int(font_base*0.95)
+    fs_asc = int(font_base*0.8)
+    label_dy = int(font_base*0.6)
+    line_h = int(font_base*1.05)
+    row_h = int(font_base*1.3)
+    planets_dy = int(font_base*1.8) + 8
+    dot_r = max(3, int(size*0.0035))
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size}" height="{size}">',
+             # text elements inherit font and color from this group
+             f'<g font-family="{font_family}" fill="{text_color}">',
+             head]
 
     # Map planets to signs
     planets = rasi_obj.get("planets", {})
-    sign_to_planets = {i: [] for i in range(1,13)}
+    # index 0 unused so signs 1..12 index directly
+    sign_to_planets = [[] for _ in range(13)]
     for p, info in planets.items():
         r = info.get("rasi")
         if not r:
@@ -149,11 +214,15 @@ def draw_south_chart_svg(rasi_obj: Dict,
         deg = info.get("degree_in_sign") or (info.get("lon", 0) % 30)
         sign_to_planets[r].append((p, deg))
 
-    # inside each cell: two-column layout for planets
+    # inside each cell: two-column layout for planets; all labels of a cell share
+    # one <text> element with absolutely positioned <tspan> lines
     for sign, sx, sy in sign_layout:
-        items = sign_to_planets.get(sign, [])
+        items = sign_to_planets[sign]
+        if not items:
+            continue
+        spans = []
         # starting y below header
-        start_y = sy + int(font_base*1.8) + 8
+        start_y = sy + planets_dy
         col_x_left = sx + 8
         col_x_right = sx + int(cell_w/2) + 6
         left = True
@@ -161,7 +230,6 @@ def draw_south_chart_svg(rasi_obj: Dict,
         for i,(p,deg) in enumerate(items):
             # planet color dot
             color = PLANET_COLORS.get(p, "#333333")
-            dot_r = max(3, int(size*0.0035))
             x_dot = col_x_left + (0 if left else (col_x_right - col_x_left))
             # text position (dot then label)
             txt_x = x_dot + dot_r + 6
@@ -171,44 +239,40 @@ def draw_south_chart_svg(rasi_obj: Dict,
             lines = _wrap_lines(label, max_chars=18)
             for li, line in enumerate(lines):
                 tx = txt_x
-                ty = y + li * int(font_base*1.05)
+                ty = y + li * line_h
                 # draw dot only on first line
                 if li == 0:
-                    dwg.add(dwg.circle(center=(x_dot, y+2), r=dot_r, fill=color, stroke="none"))
-                dwg.add(dwg.text(line,
-                                 insert=(tx, ty + int(font_base*0.6)),
-                                 font_size=int(font_base*0.95),
-                                 font_family=font_family,
-                                 fill=text_color))
+                    parts.append(f'<circle cx="{x_dot}" cy="{y+2}" r="{dot_r}" fill="{color}" stroke="none"/>')
+                spans.append(f'<tspan x="{tx}" y="{ty + label_dy}">{line}</tspan>')
             # move to next slot
             if left:
                 left = False
                 # keep same y for right column
             else:
                 left = True
-                y += int(font_base*1.3) * max(1, len(lines))  # move down after filling both columns
+                y += row_h * max(1, len(lines))  # move down after filling both columns
+        parts.append(f'<text font-size="{fs_label}">'
+                     + "".join(spans) + '</text>')
 
     # draw ASC marker box (big and visible)
     asc = rasi_obj.get("asc")
     if asc is not None:
         asc_sign = int((asc // 30) % 12) + 1
-        for sign, sx, sy in sign_layout:
-            if sign == asc_sign:
-                badge_r = int(cell_h * 0.07)
-                cx = sx + cell_w - (badge_r + 10)
-                cy = sy + (badge_r + 10)
-                dwg.add(dwg.circle(center=(cx, cy), r=badge_r, fill="#111111", stroke="#fff", stroke_width=1))
-                dwg.add(dwg.text("ASC", insert=(cx - badge_r*0.7, cy + int(badge_r*0.3)),
-                                 font_size=int(font_base*0.8), font_family=font_family, fill="#fff", font_weight="700"))
-                break
+        sx, sy = _south_layout_by_sign(size, card_margin, bool(title))[asc_sign]
+        badge_r = int(cell_h * 0.07)
+        cx = sx + cell_w - (badge_r + 10)
+        cy = sy + (badge_r + 10)
+        parts.append(f'<circle cx="{cx}" cy="{cy}" r="{badge_r}" fill="#111111" stroke="#fff" stroke-width="1"/>')
+        parts.append(f'<text x="{cx - badge_r*0.7}" y="{cy + int(badge_r*0.3)}" font-size="{fs_asc}" '
+                     f'fill="#fff" font-weight="700">ASC</text>')
 
-    # optional footer legend (small)
-    legend_y = grid_y0 + grid_h + 6
-    dwg.add(dwg.text("Legend:", insert=(margin+6, legend_y + 12), font_size=int(font_base*0.9), font_family=font_family, fill=text_color, font_weight="700"))
-    lx = margin + 74
-    for i,(pn,color) in enumerate(PLANET_COLORS.items()):
-        # small dot + short label
-        dwg.add(dwg.circle(center=(lx + i*80, legend_y + 8), r=4, fill=color))
-        dwg.add(dwg.text(pn, insert=(lx + 10 + i*80, legend_y + 12), font_size=int(font_base*0.85), font_family=font_family, fill=text_color))
+    parts.append(tail)
+    parts.append("</g></svg>")
+    return "".join(parts)
 
-    return dwg.tostring()
+def draw_south_chart_svg_bytes(rasi_obj: Dict, **kwargs) -> bytes:
+    """
+    Same as draw_south_chart_svg but returns UTF-8 encoded bytes, for callers that
+    serve or write the SVG directly. kwargs are passed through unchanged.
+    """
+    return draw_south_chart_svg(rasi_obj, **kwargs).encode("utf-8")
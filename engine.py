@@ -4,93 +4,448 @@ Robust HoroscopeEngine:
 - loads .env/.cred as before (kept minimal here)
 - builds prompt from templates/horoscope_prompt.txt (fallback)
 - ALWAYS appends the structured JSON at the end of the prompt (defensive)
-- attempts call with new or old OpenAI SDKs
+- attempts call with new or old OpenAI SDKs (imported lazily on first use)
+- streams replies from the new SDK and stops as soon as the JSON object closes
 - if the model asks for the JSON (or doesn't return JSON), retries once
   with an explicit injected prompt containing the structured JSON
-- falls back to local deterministic narrative if no LLM available
+- falls back to local deterministic narrative if no LLM available, or without
+  calling it when the payload is incomplete (too few planets / no Moon)
+- generate_analysis_many runs several analyses concurrently (AsyncOpenAI,
+  bounded semaphore, exponential backoff on rate limits)
+- submit_batch/poll_batch/fetch_results push offline (non-interactive) runs
+  through the OpenAI Batch API at half the synchronous price
+- caches parsed LLM responses (in-memory LRU + sqlite on disk) keyed by a
+  SHA-256 of the structured payload, model and language
+- optional semantic cache (ASTRO_SEMANTIC_CACHE=1): near-duplicate charts reuse
+  a prior response when their payload embeddings are close enough
 """
 
 import os
 import json
 import re
+import asyncio
+import contextlib
+import copy
+import hashlib
+import io
+import logging
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
-# optional dotenv
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# optional orjson (in requirements.txt): faster parsing of LLM output
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    import orjson
 except Exception:
-    pass
+    orjson = None
+
+def _json_loads(text):
+    # orjson first; stdlib json accepts a few things orjson rejects (NaN, Infinity)
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except Exception:
+            pass
+    return json.loads(text)
+
+def _mtime_ns(p: Path):
+    try:
+        return p.stat().st_mtime_ns
+    except OSError:
+        return None
+
+@lru_cache(maxsize=8)
+def _read_text_cached(path_str, mtime_ns):
+    """File contents memoized per (path, mtime); editing the file changes the key."""
+    return Path(path_str).read_text(encoding="utf-8")
+
+@lru_cache(maxsize=4)
+def _parse_cred(path_str, mtime_ns):
+    return json.loads(_read_text_cached(path_str, mtime_ns))
+
+@lru_cache(maxsize=1)
+def _load_env():
+    # optional dotenv, imported on first settings/credential lookup
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except Exception:
+        pass
 
 def _load_cred(path: str = ".cred"):
-    p = Path(path)
-    if not p.exists():
+    _load_env()
+    mtime = _mtime_ns(Path(path))
+    if mtime is None:
         return {}
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return dict(_parse_cred(path, mtime))
     except Exception:
         return {}
 
-_creds = _load_cred()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or _creds.get("OPENAI_API_KEY")
-ASTRO_MODEL = os.getenv("ASTRO_MODEL") or _creds.get("ASTRO_MODEL", "gpt-4o-mini")
+def _settings():
+    """
+    Environment (.env via dotenv) / .cred settings, resolved on use rather than at import
+    so `import engine` stays cheap. .env is loaded once; .cred is re-parsed only when its
+    mtime changes, so each lookup (e.g. every HoroscopeEngine()) sees the current file.
+    """
+    creds = _load_cred()
+    return {
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or creds.get("OPENAI_API_KEY"),
+        "ASTRO_MODEL": os.getenv("ASTRO_MODEL") or creds.get("ASTRO_MODEL", "gpt-4o-mini"),
+        # on-disk response cache; set ASTRO_CACHE_PATH="" to keep the cache in memory only
+        "ASTRO_CACHE_PATH": os.getenv("ASTRO_CACHE_PATH", ".llm_cache.sqlite"),
+        # semantic (embedding) cache for near-duplicate payloads; off unless enabled
+        "ASTRO_SEMANTIC_CACHE": (os.getenv("ASTRO_SEMANTIC_CACHE") or "").lower() in ("1", "true", "yes"),
+        "ASTRO_EMBED_MODEL": os.getenv("ASTRO_EMBED_MODEL") or "text-embedding-3-small",
+        "ASTRO_SEMANTIC_THRESHOLD": float(os.getenv("ASTRO_SEMANTIC_THRESHOLD") or 0.97),
+    }
 
-# OpenAI import detection (new/old)
-try:
-    import openai as _openai_module
-except Exception:
-    _openai_module = None
+def __getattr__(name):
+    # module-level OPENAI_API_KEY, ASTRO_MODEL, ... stay readable (resolved lazily)
+    settings = _settings()
+    if name in settings:
+        return settings[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from openai import OpenAI as OpenAIClient  # new SDK
-    _has_new_client = True
-except Exception:
-    OpenAIClient = None
-    _has_new_client = False
+# async path: max in-flight requests and attempts per request (429 backoff)
+_LLM_CONCURRENCY = 5
+_LLM_MAX_ATTEMPTS = 5
+_LLM_MAX_BACKOFF = 30.0
+
+# The OpenAI SDK is heavy to import; it is loaded on first use, not at module import.
+@lru_cache(maxsize=1)
+def _openai_sdk():
+    """The openai module (new or old SDK), or None when not installed."""
+    try:
+        import openai
+    except Exception:
+        return None
+    api_key = _settings()["OPENAI_API_KEY"]
+    if api_key:
+        try:
+            setattr(openai, "api_key", api_key)
+        except Exception:
+            pass
+    return openai
 
-_has_old_style = bool(_openai_module and getattr(_openai_module, "ChatCompletion", None))
+def _get_client():
+    """Shared new-SDK (openai>=1.0) client, or None without the SDK or an API key."""
+    return _client_for(_settings()["OPENAI_API_KEY"])
 
-_openai_client = None
-if _has_new_client and OPENAI_API_KEY:
+@lru_cache(maxsize=1)
+def _client_for(api_key):
+    # keyed on the key, so a changed OPENAI_API_KEY (.cred edit) gets a new client
+    client_cls = getattr(_openai_sdk(), "OpenAI", None)
+    if client_cls is None or not api_key:
+        return None
     try:
-        _openai_client = OpenAIClient(api_key=OPENAI_API_KEY)
+        return client_cls(api_key=api_key)
     except Exception:
         try:
-            _openai_client = OpenAIClient()
+            return client_cls()
+        except Exception:
+            return None
+
+def _rate_limit_error():
+    return getattr(_openai_sdk(), "RateLimitError", None)
+
+class ResponseCache:
+    """
+    Parsed-response cache: an in-memory LRU in front of an optional sqlite table.
+    lookup(key) -> value or None; update(key, value) stores a JSON-serializable value.
+    Values are copied in and out, so callers can't mutate a cached entry.
+    The sqlite file and table are created on first use, not at construction.
+    Disk errors are swallowed; the cache is an optimization, never a failure source.
+    """
+
+    def __init__(self, path=None, maxsize=256):
+        # path=None -> ASTRO_CACHE_PATH; "" -> memory only
+        if path is None:
+            path = _settings()["ASTRO_CACHE_PATH"]
+        self.path = Path(path) if path else None
+        self.maxsize = maxsize
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._table_ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.path), timeout=5)
+        if not self._table_ready:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._table_ready = True
+        return conn
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    def lookup(self, key):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return copy.deepcopy(self._mem[key])
+        if not self.path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        except Exception:
+            return None
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[0])
         except Exception:
-            _openai_client = None
-if _openai_module and OPENAI_API_KEY:
+            return None
+        self._remember(key, copy.deepcopy(value))
+        return value
+
+    def update(self, key, value):
+        self._remember(key, copy.deepcopy(value))
+        if not self.path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+                             (key, json.dumps(value, ensure_ascii=False)))
+        except Exception:
+            pass
+
+@lru_cache(maxsize=1)
+def _shared_response_cache():
+    """Response cache shared across HoroscopeEngine instances (Streamlit builds one per submit)."""
+    return ResponseCache()
+
+class SemanticCache:
+    """
+    Brute-force cosine index over unit-normalized payload embeddings (a NumPy
+    stand-in for a flat inner-product index; a few thousand charts fit easily).
+    An entry only matches when its chart signature (rasi/navamsa signs, dasa,
+    yogas, lang, model) is equal, so a close embedding can never hand back the
+    reading of a different chart. Values are copied in and out.
+    """
+
+    def __init__(self, threshold=None, maxsize=2048):
+        self.threshold = _settings()["ASTRO_SEMANTIC_THRESHOLD"] if threshold is None else threshold
+        self.maxsize = maxsize
+        self._vectors = None
+        self._entries = []  # (signature, value), row-aligned with _vectors
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding, signature):
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                return None
+            sims = self._vectors @ embedding
+            for i in np.argsort(sims)[::-1]:
+                if sims[i] < self.threshold:
+                    return None
+                if self._entries[i][0] == signature:
+                    return copy.deepcopy(self._entries[i][1])
+        return None
+
+    def add(self, embedding, signature, value):
+        with self._lock:
+            row = embedding[None, :]
+            if self._vectors is None or self._vectors.shape[1] != embedding.shape[0]:
+                self._vectors, self._entries = row, []
+            else:
+                self._vectors = np.vstack([self._vectors, row])
+            self._entries.append((signature, copy.deepcopy(value)))
+            if len(self._entries) > self.maxsize:
+                self._vectors = self._vectors[-self.maxsize:]
+                self._entries = self._entries[-self.maxsize:]
+
+@lru_cache(maxsize=1)
+def _shared_semantic_cache():
+    return SemanticCache()
+
+def _round_floats(obj, ndigits):
+    if isinstance(obj, float):
+        return round(obj, ndigits)
+    if isinstance(obj, dict):
+        return {k: _round_floats(v, ndigits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_round_floats(v, ndigits) for v in obj]
+    return obj
+
+def _normalize_payload(structured):
+    """
+    Regularize a payload before embedding: longitudes/degrees to 0.01 and the
+    birth time snapped to the nearest minute, so trivial jitter maps to the same text.
+    """
+    norm = _round_floats(structured, 2)
+    meta = norm.get("meta")
+    if isinstance(meta, dict) and isinstance(meta.get("datetime"), str):
+        try:
+            dt = datetime.fromisoformat(meta["datetime"]) + timedelta(seconds=30)
+            meta["datetime"] = dt.replace(second=0, microsecond=0).isoformat()
+        except ValueError:
+            pass
+    return norm
+
+def _chart_signature(structured, model, lang):
+    """Discrete chart identity that must match exactly for a semantic hit."""
+    rasi = structured.get("rasi") or {}
+    signs = tuple(sorted((p, (info or {}).get("rasi")) for p, info in rasi.items()))
+    asc = structured.get("asc")
+    asc_sign = int(asc // 30) % 12 + 1 if isinstance(asc, (int, float)) else None
+    navamsa = structured.get("navamsa") or {}
+    nav_signs = tuple(sorted((p, (info or {}).get("nav_sign")) for p, info in navamsa.items()))
+    dasa = (structured.get("dasas") or {}).get("current")
+    yogas = tuple(structured.get("yogas") or ())
+    return (model, lang, asc_sign, signs, nav_signs, dasa, yogas)
+
+_SYSTEM_PROMPT = "You are an expert Vedic astrologer and write in a culturally sensitive manner."
+
+def _canonical_json(structured):
+    """
+    Byte-for-byte deterministic JSON (sorted keys, no whitespace) for prompts and cache keys.
+    Always the stdlib encoder: orjson formats some floats differently (1e-7 vs 1e-07), which
+    would make keys depend on whether it is installed.
+    """
+    return json.dumps(structured, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+# fewer placements than this (or no Moon) is not worth an LLM round trip
+_MIN_PLANETS = 5
+
+def _is_payload_sufficient(p):
+    """Cheap check that the structured payload can support a reading (planets present, Moon known)."""
+    rasi = (p or {}).get("rasi") or {}
+    return len(rasi) >= _MIN_PLANETS and "Moon" in rasi
+
+def _cache_key(structured, model, lang, canonical=None, prompt_key=None):
+    """
+    Deterministic SHA-256 over the canonical payload JSON, model, language and the
+    prompt prefix hash (_prompt_cache_key), so editing the template or system prompt
+    invalidates cached readings.
+    """
+    if canonical is None:
+        canonical = _canonical_json(structured)
+    if prompt_key is None:
+        prompt_key = _prompt_cache_key(lang)
+    h = hashlib.sha256(canonical.encode("utf-8"))
+    h.update(b"\0" + (model or "").encode("utf-8"))
+    h.update(b"\0" + (lang or "").encode("utf-8"))
+    h.update(b"\0" + prompt_key.encode("utf-8"))
+    return h.hexdigest()
+
+def _prompt_template(lang):
+    template_path = Path("templates") / "horoscope_prompt.txt"
+    mtime = _mtime_ns(template_path)
+    if mtime is not None:
+        try:
+            return _read_text_cached(str(template_path), mtime)
+        except Exception:
+            pass
+    # fallback minimal template (Tamil-first)
+    if lang and lang.startswith("ta"):
+        return (
+            "You are an experienced Vedic astrologer. Reply in JSON only with keys: "
+            '{"headline":"","bullets":[],"narrative":"","yogas":[],"dasas":{}}.\n\n'
+            "Please analyze the following chart. Input:\n{input}\n"
+        )
+    return (
+        "You are an experienced Vedic astrologer. Reply in JSON only with keys: "
+        '{"headline":"","bullets":[],"narrative":"","yogas":[],"dasas":{}}.\n\n'
+        "Please analyze the following chart. Input:\n{input}\n"
+    )
+
+def _prompt_cache_key(lang):
+    """
+    Stable id of the static prompt prefix (system message + template), sent as
+    OpenAI's prompt_cache_key so repeat calls are routed to the same prefix cache.
+    """
+    prefix = _SYSTEM_PROMPT + "\0" + _prompt_template(lang)
+    return "sahadev-" + hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+def _parse_duration(value):
+    """
+    Seconds from an OpenAI rate-limit header: retry-after ("2") or
+    x-ratelimit-reset-* ("1s", "250ms", "6m0s"). None if absent/unparseable.
+    """
+    if not value:
+        return None
     try:
-        setattr(_openai_module, "api_key", OPENAI_API_KEY)
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    parts = _DURATION_RE.findall(str(value))
+    if not parts:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+def _backoff_delay(headers, attempt):
+    """Honor retry-after when the server sends it, else exponential backoff with jitter."""
+    delay = _parse_duration(headers.get("retry-after")) if headers else None
+    if delay is None:
+        delay = min(2 ** attempt, _LLM_MAX_BACKOFF) + random.uniform(0, 1)
+    return min(delay, _LLM_MAX_BACKOFF)
+
+# typical phrasing models use when asking for the data, as one alternation
+_ASK_JSON_PATTERNS = (
+    r"please provide.*structured.*json",
+    r"please provide.*json",
+    r"please provide the chart json",
+    r"send me the json",
+    r"i need the json",
+    r"provide the structured json",
+)
+_ASK_JSON_RE = re.compile("|".join(f"(?:{p})" for p in _ASK_JSON_PATTERNS), re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_BRACE_RE = re.compile(r"[{}]")
+
+def _loads_lenient(candidate: str):
+    """Parse a JSON object candidate, dropping trailing commas only if needed; None if invalid."""
+    try:
+        return _json_loads(candidate)
     except Exception:
         pass
+    # the cleanup pass runs only on malformed candidates, so valid strings stay untouched
+    try:
+        return _json_loads(_TRAILING_COMMA_RE.sub(r"\1", candidate))
+    except Exception:
+        return None
 
 def _extract_json_from_text(text: str):
     if not text:
         return None
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except Exception:
         pass
     start = text.find("{")
     if start == -1:
         return None
+    # common case: prose around a single object -> outermost braces
+    end = text.rfind("}")
+    if end > start:
+        parsed = _loads_lenient(text[start:end+1])
+        if parsed is not None:
+            return parsed
+    # otherwise jump between brace positions to the end of the first balanced object
     depth = 0
-    for i in range(start, len(text)):
-        ch = text[i]
-        if ch == "{":
+    for m in _BRACE_RE.finditer(text, start):
+        if m.group() == "{":
             depth += 1
-        elif ch == "}":
+        else:
             depth -= 1
             if depth == 0:
-                candidate = text[start:i+1]
-                cleaned = re.sub(r",\s*}", "}", candidate)
-                cleaned = re.sub(r",\s*]", "]", cleaned)
-                cleaned = cleaned.strip("` \n\r\t")
-                try:
-                    return json.loads(cleaned)
-                except Exception:
-                    return None
+                return _loads_lenient(text[start:m.end()])
     return None
 
 def _resp_text_from_new(resp):
@@ -111,6 +466,51 @@ def _resp_text_from_new(resp):
         pass
     return None
 
+def _resp_text_from_stream(stream):
+    """
+    Accumulate a streamed chat completion. Only the first top-level {...} is
+    used downstream, so once it closes and parses the stream is stopped early.
+    """
+    parts = []
+    size = 0
+    depth = 0
+    start = None
+    tracking = True
+    try:
+        for chunk in stream:
+            try:
+                delta = chunk.choices[0].delta.content
+            except Exception:
+                delta = None
+            if not delta:
+                continue
+            parts.append(delta)
+            if tracking:
+                for m in _BRACE_RE.finditer(delta):
+                    if m.group() == "{":
+                        if start is None:
+                            start = size + m.start()
+                        depth += 1
+                    elif start is not None:
+                        depth -= 1
+                        if depth == 0:
+                            end = size + m.end()
+                            text = "".join(parts)
+                            if _loads_lenient(text[start:end]) is not None:
+                                return text[:end]
+                            # not valid JSON; read the whole reply like the non-streaming path
+                            tracking = False
+                            break
+            size += len(delta)
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+    return "".join(parts) or None
+
 def _resp_text_from_old(resp):
     try:
         if isinstance(resp, dict):
@@ -130,9 +530,14 @@ def _resp_text_from_old(resp):
     return None
 
 class HoroscopeEngine:
-    def __init__(self, api_key_env="OPENAI_API_KEY"):
-        self.api_key = os.getenv(api_key_env) or OPENAI_API_KEY
-        self.model = os.getenv("ASTRO_MODEL") or ASTRO_MODEL
+    def __init__(self, api_key_env="OPENAI_API_KEY", cache=None):
+        settings = _settings()  # loads .env first, so os.getenv sees its values
+        self.api_key = os.getenv(api_key_env) or settings["OPENAI_API_KEY"]
+        self.model = os.getenv("ASTRO_MODEL") or settings["ASTRO_MODEL"]
+        self.cache = cache if cache is not None else _shared_response_cache()
+        self.semantic_cache = _shared_semantic_cache()
+        # (event loop, AsyncOpenAI client), created lazily inside the running loop
+        self._async_client = None
 
     def format_structured(self, rasi, nav, meta):
         payload = {
@@ -150,28 +555,13 @@ class HoroscopeEngine:
         return payload
 
     def _load_prompt_template(self, lang="ta"):
-        template_path = Path("templates") / "horoscope_prompt.txt"
-        if template_path.exists():
-            try:
-                return template_path.read_text(encoding="utf-8")
-            except Exception:
-                pass
-        # fallback minimal template (Tamil-first)
-        if lang and lang.startswith("ta"):
-            return (
-                "You are an experienced Vedic astrologer. Reply in JSON only with keys: "
-                '{"headline":"","bullets":[],"narrative":"","yogas":[],"dasas":{}}.\n\n'
-                "Please analyze the following chart. Input:\n{input}\n"
-            )
-        return (
-            "You are an experienced Vedic astrologer. Reply in JSON only with keys: "
-            '{"headline":"","bullets":[],"narrative":"","yogas":[],"dasas":{}}.\n\n'
-            "Please analyze the following chart. Input:\n{input}\n"
-        )
+        return _prompt_template(lang)
 
-    def _build_prompt(self, structured, lang="ta"):
+    def _build_prompt(self, structured, lang="ta", canonical=None):
+        # static instructions first, canonical JSON last: only the tail varies between
+        # calls, which keeps the prefix eligible for OpenAI's automatic prompt caching
         template = self._load_prompt_template(lang=lang)
-        s = json.dumps(structured, indent=2, ensure_ascii=False)
+        s = canonical if canonical is not None else _canonical_json(structured)
         # Replace common placeholders defensively
         if "{{ structured_data }}" in template:
             prompt = template.replace("{{ structured_data }}", s)
@@ -185,79 +575,380 @@ class HoroscopeEngine:
     def _model_requests_json(self, text: str) -> bool:
         if not text:
             return False
-        # typical phrasing models use when asking for the data
-        ask_patterns = [
-            r"please provide.*structured.*json",
-            r"please provide.*json",
-            r"please provide the chart json",
-            r"send me the json",
-            r"i need the json",
-            r"provide the structured json",
-        ]
-        t = text.lower()
-        for p in ask_patterns:
-            if re.search(p, t):
-                return True
-        return False
+        return bool(_ASK_JSON_RE.search(text))
 
-    def _call_llm(self, messages):
+    def _call_llm(self, messages, prompt_cache_key=None):
         # Try new OpenAI client first
-        if _openai_client:
+        client = _get_client()
+        if client:
+            extra = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
             try:
-                resp = _openai_client.chat.completions.create(model=self.model, messages=messages, max_tokens=1200)
-                text = _resp_text_from_new(resp)
+                # stream so the call can return as soon as the JSON object is complete
+                try:
+                    resp = client.chat.completions.create(model=self.model, messages=messages, max_tokens=1200,
+                                                          stream=True, **extra)
+                except TypeError:
+                    # SDKs predating prompt_cache_key reject the keyword
+                    resp = client.chat.completions.create(model=self.model, messages=messages, max_tokens=1200,
+                                                          stream=True)
+                text = _resp_text_from_stream(resp)
                 return text
             except Exception:
                 pass
         # Then try old-style openai module
-        if _openai_module and getattr(_openai_module, "ChatCompletion", None):
+        sdk = _openai_sdk()
+        if sdk and getattr(sdk, "ChatCompletion", None):
             try:
-                resp = _openai_module.ChatCompletion.create(model=self.model, messages=messages, max_tokens=1200)
+                resp = sdk.ChatCompletion.create(model=self.model, messages=messages, max_tokens=1200)
                 text = _resp_text_from_old(resp)
                 return text
             except Exception:
                 pass
         return None
 
+    def _semantic_probe(self, structured, lang):
+        """
+        Embed the normalized payload for the semantic cache.
+        Returns (unit embedding, signature) or None when disabled or unavailable.
+        """
+        settings = _settings()
+        client = _get_client() if settings["ASTRO_SEMANTIC_CACHE"] else None
+        if not client:
+            return None
+        try:
+            resp = client.embeddings.create(model=settings["ASTRO_EMBED_MODEL"],
+                                            input=_canonical_json(_normalize_payload(structured)))
+            vec = np.asarray(resp.data[0].embedding, dtype=np.float32)
+        except Exception:
+            return None
+        norm = float(np.linalg.norm(vec))
+        if not norm:
+            return None
+        return vec / norm, _chart_signature(structured, self.model, lang)
+
+    def _remember(self, cache_key, value, probe=None):
+        self.cache.update(cache_key, value)
+        if probe is not None:
+            self.semantic_cache.add(probe[0], probe[1], value)
+
+    def _get_async_client(self):
+        # AsyncOpenAI's connection pool is tied to the loop that created it, so the
+        # client is kept as (loop, client) and rebuilt when called from another loop
+        # (e.g. a second asyncio.run)
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client[0] is loop:
+            return self._async_client[1]
+        self._async_client = None
+        async_cls = getattr(_openai_sdk(), "AsyncOpenAI", None) if self.api_key else None
+        if async_cls:
+            try:
+                self._async_client = (loop, async_cls(api_key=self.api_key))
+            except Exception:
+                self._async_client = None
+        return self._async_client[1] if self._async_client is not None else None
+
+    async def _close_async_client(self):
+        bound, self._async_client = self._async_client, None
+        client = bound[1] if bound is not None else None
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    async def _call_llm_async(self, messages, prompt_cache_key=None, semaphore=None):
+        """
+        Async counterpart of _call_llm. At most `semaphore` requests are in flight;
+        rate-limit (429) errors are retried with backoff, honoring retry-after.
+        When the request budget is exhausted (x-ratelimit-remaining-requests == 0)
+        the slot is held until the reset window passes, throttling sibling calls.
+        """
+        slot = semaphore if semaphore is not None else contextlib.nullcontext()
+        client = self._get_async_client()
+        if client is None:
+            # no async SDK: run the sync path in a worker thread
+            async with slot:
+                return await asyncio.to_thread(self._call_llm, messages, prompt_cache_key)
+
+        extra = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
+        attempt = 0
+        while True:
+            async with slot:
+                try:
+                    raw = await client.chat.completions.with_raw_response.create(
+                        model=self.model, messages=messages, max_tokens=1200, **extra)
+                except TypeError:
+                    # SDKs predating prompt_cache_key reject the keyword; retried at once,
+                    # outside the 429 attempt budget
+                    if not extra:
+                        return None
+                    extra = {}
+                    continue
+                except Exception as e:
+                    rate_limit_error = _rate_limit_error()
+                    if rate_limit_error is None or not isinstance(e, rate_limit_error):
+                        return None
+                    if attempt == _LLM_MAX_ATTEMPTS - 1:
+                        # last attempt: no point sleeping before giving up
+                        return None
+                    delay = _backoff_delay(getattr(getattr(e, "response", None), "headers", None), attempt)
+                else:
+                    try:
+                        text = _resp_text_from_new(raw.parse())
+                    except Exception:
+                        return None
+                    if raw.headers.get("x-ratelimit-remaining-requests") == "0":
+                        wait = _parse_duration(raw.headers.get("x-ratelimit-reset-requests"))
+                        if wait:
+                            await asyncio.sleep(min(wait, _LLM_MAX_BACKOFF))
+                    return text
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_messages(self, structured, canonical=None):
+        # same canonical serialization as the first attempt (no re-encoding when passed in)
+        injected_prompt = (
+            "Proceed using the following structured JSON (do not ask for it again). "
+            "Use it to produce JSON with keys: headline, bullets, narrative, yogas, dasas.\n\n"
+            + (canonical if canonical is not None else _canonical_json(structured))
+        )
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": injected_prompt}
+        ]
+
+    def _prepare_analysis(self, structured, lang):
+        """
+        Shared pre-call step of generate_analysis / generate_analysis_async.
+        Returns (result, None) when no LLM call is needed (incomplete payload -> fallback,
+        or an exact cache hit), else (None, ctx) with the serialized payload and cache key.
+        """
+        if not _is_payload_sufficient(structured):
+            logger.info("payload insufficient for LLM analysis; using local fallback")
+            return self._fallback_text(structured), None
+        # serialize once: cache key, first prompt and retry prompt share it
+        canonical = _canonical_json(structured)
+        prompt_key = _prompt_cache_key(lang)
+        cache_key = _cache_key(structured, self.model, lang, canonical, prompt_key)
+        cached = self.cache.lookup(cache_key)
+        if cached is not None:
+            return cached, None
+        return None, {"structured": structured, "lang": lang, "canonical": canonical,
+                      "cache_key": cache_key, "prompt_cache_key": prompt_key}
+
+    def _semantic_lookup(self, probe):
+        # approximate hit: served, but never promoted into the exact cache
+        if probe is None:
+            return None
+        return self.semantic_cache.lookup(*probe)
+
+    def _handle_reply(self, text, ctx, probe):
+        """
+        Shared post-call step for the first LLM reply.
+        Returns (result, None) when done, or (None, retry_messages) to retry once with the
+        JSON injected (the model asked for it, or returned nothing usable).
+        """
+        parsed = _extract_json_from_text(text or "")
+        if parsed:
+            self._remember(ctx["cache_key"], parsed, probe)
+            return parsed, None
+        if text and (self._model_requests_json(text) or parsed is None):
+            return None, self._retry_messages(ctx["structured"], ctx["canonical"])
+        # If no LLM available or nothing useful, fallback
+        return self._fallback_text(ctx["structured"]), None
+
+    def _handle_retry_reply(self, text2, text, ctx, probe):
+        parsed2 = _extract_json_from_text(text2 or "")
+        if parsed2:
+            self._remember(ctx["cache_key"], parsed2, probe)
+            return parsed2
+        # If still nothing, return the LLM text as narrative (helpful feedback)
+        return {"narrative": (text2 or text or "LLM produced no usable output.")}
+
     def generate_analysis(self, structured_payload, lang="ta"):
         """
         Generate analysis. If the model asks for the structured JSON, retry once with the JSON explicitly
         injected at the top of the prompt.
+        Successfully parsed responses are cached; identical payloads skip the LLM call,
+        and with ASTRO_SEMANTIC_CACHE=1 near-identical ones do too.
+        Incomplete payloads (see _is_payload_sufficient) go straight to the local fallback.
         """
-        # Build initial prompt
-        prompt = self._build_prompt(structured_payload, lang=lang)
-        messages = [
-            {"role": "system", "content": "You are an expert Vedic astrologer and write in a culturally sensitive manner."},
-            {"role": "user", "content": prompt}
-        ]
+        result, ctx = self._prepare_analysis(structured_payload, lang)
+        if ctx is None:
+            return result
+        probe = self._semantic_probe(structured_payload, lang)
+        cached = self._semantic_lookup(probe)
+        if cached is not None:
+            return cached
 
-        text = self._call_llm(messages)
-        parsed = _extract_json_from_text(text or "")
+        messages = self._initial_messages(structured_payload, lang, ctx["canonical"])
+        text = self._call_llm(messages, prompt_cache_key=ctx["prompt_cache_key"])
+        result, messages_retry = self._handle_reply(text, ctx, probe)
+        if messages_retry is None:
+            return result
+        text2 = self._call_llm(messages_retry, prompt_cache_key=ctx["prompt_cache_key"])
+        return self._handle_retry_reply(text2, text, ctx, probe)
 
-        # If parsed JSON found, return it
-        if parsed:
-            return parsed
+    async def generate_analysis_async(self, structured_payload, lang="ta", semaphore=None):
+        """
+        Async version of generate_analysis (same caching, retry and fallback rules).
+        Pass a shared asyncio.Semaphore to bound concurrency across calls.
+        """
+        result, ctx = self._prepare_analysis(structured_payload, lang)
+        if ctx is None:
+            return result
+        probe = await asyncio.to_thread(self._semantic_probe, structured_payload, lang)
+        cached = self._semantic_lookup(probe)
+        if cached is not None:
+            return cached
 
-        # If model explicitly asked for the JSON (or returned nothing usable), retry once with explicit injection
-        if text and (self._model_requests_json(text) or parsed is None):
-            injected_prompt = (
-                "Proceed using the following structured JSON (do not ask for it again). "
-                "Use it to produce JSON with keys: headline, bullets, narrative, yogas, dasas.\n\n"
-                + json.dumps(structured_payload, indent=2, ensure_ascii=False)
-            )
-            messages_retry = [
-                {"role": "system", "content": "You are an expert Vedic astrologer and write in a culturally sensitive manner."},
-                {"role": "user", "content": injected_prompt}
-            ]
-            text2 = self._call_llm(messages_retry)
-            parsed2 = _extract_json_from_text(text2 or "")
-            if parsed2:
-                return parsed2
-            # If still nothing, return the LLM text as narrative (helpful feedback)
-            return {"narrative": (text2 or text or "LLM produced no usable output.")}
+        messages = self._initial_messages(structured_payload, lang, ctx["canonical"])
+        text = await self._call_llm_async(messages, prompt_cache_key=ctx["prompt_cache_key"], semaphore=semaphore)
+        result, messages_retry = self._handle_reply(text, ctx, probe)
+        if messages_retry is None:
+            return result
+        text2 = await self._call_llm_async(messages_retry, prompt_cache_key=ctx["prompt_cache_key"],
+                                           semaphore=semaphore)
+        return self._handle_retry_reply(text2, text, ctx, probe)
 
-        # If no LLM available or nothing useful, fallback
-        return self._fallback_text(structured_payload)
+    def generate_analysis_many(self, payloads, lang="ta", concurrency=_LLM_CONCURRENCY):
+        """
+        Analyze several structured payloads concurrently; returns results in input order.
+        Wall time is roughly the slowest call rather than the sum of all calls.
+        Duplicate payloads (same cache key) are analyzed once and share the result.
+        Must be called from synchronous code (it runs its own event loop).
+        """
+        payloads = list(payloads)
+        prompt_key = _prompt_cache_key(lang)
+        keys = [_cache_key(p, self.model, lang, prompt_key=prompt_key) for p in payloads]
+        unique = {}
+        for key, p in zip(keys, payloads):
+            unique.setdefault(key, p)
+
+        async def _run():
+            semaphore = asyncio.Semaphore(concurrency)
+            try:
+                return await asyncio.gather(
+                    *(self.generate_analysis_async(p, lang=lang, semaphore=semaphore) for p in unique.values()))
+            finally:
+                await self._close_async_client()
+        results = dict(zip(unique, asyncio.run(_run())))
+        # independent copies, so callers mutating one duplicate's result don't affect another
+        return [copy.deepcopy(results[key]) for key in keys]
+
+    def _initial_messages(self, structured, lang, canonical=None):
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": self._build_prompt(structured, lang=lang, canonical=canonical)}
+        ]
+
+    def submit_batch(self, payloads, lang="ta", completion_window="24h"):
+        """
+        Submit payloads to the OpenAI Batch API (/v1/chat/completions, 24h window, 50% price).
+        For nightly precomputes / backfills, not interactive use.
+        Returns {"batch_id": ..., "custom_ids": [...]} with one custom_id per payload (input order);
+        custom_ids are the response-cache keys, so fetch_results can warm the cache.
+        Payloads already in the cache are not resubmitted. Incomplete payloads (see
+        _is_payload_sufficient) are not sent either; their local fallback readings are
+        returned under "fallbacks" as {custom_id: result}.
+        When nothing needs sending, batch_id is None and no batch is created. Pass the whole
+        return value to poll_batch / fetch_results: they treat batch_id None as completed,
+        and fetch_results fills in cached and fallback results for every custom_id.
+        """
+        client = _get_client()
+        if not client:
+            raise RuntimeError("OpenAI client not configured (set OPENAI_API_KEY and install openai>=1.0)")
+        custom_ids = []
+        lines = {}
+        fallbacks = {}
+        prompt_key = _prompt_cache_key(lang)
+        for payload in payloads:
+            canonical = _canonical_json(payload)
+            custom_id = _cache_key(payload, self.model, lang, canonical, prompt_key)
+            custom_ids.append(custom_id)
+            if custom_id in lines or custom_id in fallbacks:
+                continue
+            if not _is_payload_sufficient(payload):
+                logger.info("payload insufficient for LLM analysis; not submitted to batch")
+                fallbacks[custom_id] = self._fallback_text(payload)
+                continue
+            if self.cache.lookup(custom_id) is not None:
+                continue
+            lines[custom_id] = json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": self.model, "messages": self._initial_messages(payload, lang, canonical), "max_tokens": 1200},
+            }, ensure_ascii=False)
+        if not lines:
+            return {"batch_id": None, "custom_ids": custom_ids, "fallbacks": fallbacks}
+        data = ("\n".join(lines.values()) + "\n").encode("utf-8")
+        batch_file = client.files.create(file=("horoscope_batch.jsonl", io.BytesIO(data)), purpose="batch")
+        batch = client.batches.create(input_file_id=batch_file.id,
+                                      endpoint="/v1/chat/completions",
+                                      completion_window=completion_window)
+        return {"batch_id": batch.id, "custom_ids": custom_ids, "fallbacks": fallbacks}
+
+    def poll_batch(self, batch):
+        """
+        Return the batch status ("validating", "in_progress", "completed", "failed", ...).
+        `batch` is a batch id or the submit_batch() return value; a submission that had
+        nothing to send (batch_id None: all cached or incomplete) is "completed".
+        """
+        batch_id = batch.get("batch_id") if isinstance(batch, dict) else batch
+        if batch_id is None:
+            return "completed"
+        client = _get_client()
+        if not client:
+            raise RuntimeError("OpenAI client not configured (set OPENAI_API_KEY and install openai>=1.0)")
+        return client.batches.retrieve(batch_id).status
+
+    def fetch_results(self, batch):
+        """
+        Download a completed batch and return {custom_id: result}. Parsed JSON results are
+        stored in the response cache, so later generate_analysis calls for the same payload hit it.
+        Unparseable outputs come back as {"narrative": <text>} like generate_analysis does;
+        failed requests are omitted.
+        `batch` is a batch id or the submit_batch() return value. Given the latter, payloads
+        that were never sent are filled in too (their "fallbacks" and cached readings), so
+        every custom_id has a result unless its request failed; batch_id None downloads nothing.
+        """
+        submission = batch if isinstance(batch, dict) else {}
+        batch_id = submission.get("batch_id") if isinstance(batch, dict) else batch
+        results = {}
+        if batch_id is not None:
+            client = _get_client()
+            if not client:
+                raise RuntimeError("OpenAI client not configured (set OPENAI_API_KEY and install openai>=1.0)")
+            output_file_id = getattr(client.batches.retrieve(batch_id), "output_file_id", None)
+            content = client.files.content(output_file_id).text if output_file_id else ""
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    custom_id = row["custom_id"]
+                    response = row.get("response") or {}
+                    if response.get("status_code") != 200:
+                        continue
+                    text = response["body"]["choices"][0]["message"]["content"]
+                except Exception:
+                    continue
+                parsed = _extract_json_from_text(text or "")
+                if parsed:
+                    self.cache.update(custom_id, parsed)
+                    results[custom_id] = parsed
+                else:
+                    results[custom_id] = {"narrative": text or "LLM produced no usable output."}
+        # payloads submit_batch did not send: local fallbacks, then response-cache hits
+        for custom_id, result in (submission.get("fallbacks") or {}).items():
+            results.setdefault(custom_id, result)
+        for custom_id in submission.get("custom_ids") or ():
+            if custom_id not in results:
+                cached = self.cache.lookup(custom_id)
+                if cached is not None:
+                    results[custom_id] = cached
+        return results
 
     def _fallback_text(self, structured):
         rasi = structured.get("rasi", {})
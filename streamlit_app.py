@@ -1,4 +1,5 @@
 # streamlit_app.py (updated)
+import json
 import streamlit as st
 from datetime import datetime
 from astrology import ChartCalculator
@@ -10,6 +11,25 @@ from utils import geocode_place, ensure_tzaware
 
 st.set_page_config(page_title="Sahadev a Vedic Horoscope", layout="centered")
 
+# Cached compute steps: reruns with unchanged inputs (e.g. only the chart style
+# toggled) skip the ephemeris math and yoga heuristics. LLM readings are cached
+# by the engine itself (parsed responses only).
+@st.cache_data(show_spinner=False)
+def _compute_charts(dt_iso, lat, lon, tz, ayanamsa, house_system):
+    calc = ChartCalculator(datetime.fromisoformat(dt_iso), lat, lon, tz, ayanamsa=ayanamsa, house_system=house_system)
+    rasi = calc.get_rasi_chart()
+    return rasi, calc.get_navamsa_chart(rasi), calc.metadata()
+
+@st.cache_data(show_spinner=False)
+def _analyze_yogas(rasi, nav, dt_iso):
+    return analyze_chart_for_yogas_and_dasas(rasi, nav, birth_dt=datetime.fromisoformat(dt_iso))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _render_chart(style, rasi_key, size, bg, fg, title, _rasi):
+    # SVG is a pure function of (rasi, render params); rasi_key stands in for _rasi
+    draw = draw_north_chart_svg if style == "NorthIndian" else draw_south_chart_svg
+    return draw(_rasi, size=size, bg_color=bg, text_color=fg, title=title)
+
 st.title("Sahadev a Vedic Horoscope (North & South Indian)")
 
 with st.form("birth_form"):
@@ -33,15 +53,13 @@ if submit:
     else:
         dt_naive = datetime.combine(dob, tob)
         dt = ensure_tzaware(dt_naive, tz)
-        calc = ChartCalculator(dt, loc["lat"], loc["lon"], tz, ayanamsa=ayanamsa, house_system=house_system)
-        rasi = calc.get_rasi_chart()
-        nav = calc.get_navamsa_chart()
+        dt_iso = dt.isoformat()
+        rasi, nav, meta = _compute_charts(dt_iso, loc["lat"], loc["lon"], tz, ayanamsa, house_system)
 
         # Render chart: increase size and ensure white background for contrast
-        if chart_style == "NorthIndian":
-            svg = draw_north_chart_svg(rasi, size=1000, bg_color="#ffffff", text_color="#111111", title="Rasi Chart (North Indian)")
-        else:
-            svg = draw_south_chart_svg(rasi, size=1000, bg_color="#ffffff", text_color="#111111", title="Rasi Chart (South Indian)")
+        title = "Rasi Chart (North Indian)" if chart_style == "NorthIndian" else "Rasi Chart (South Indian)"
+        rasi_key = json.dumps(rasi, sort_keys=True, default=str)
+        svg = _render_chart(chart_style, rasi_key, 1000, "#ffffff", "#111111", title, rasi)
 
         st.header("Rasi Chart")
         st.components.v1.html(svg, height=1000, scrolling=True)
@@ -50,14 +68,14 @@ if submit:
         st.code(nav)
 
         # Yogas & Dasas (heuristic or library if installed)
-        analysis_yogas = analyze_chart_for_yogas_and_dasas(rasi, nav, birth_dt=dt)
+        analysis_yogas = _analyze_yogas(rasi, nav, dt_iso)
 
         st.subheader("Detected Yogas & Dasas (preliminary)")
         st.json(analysis_yogas)
 
         # LLM analysis
         engine = HoroscopeEngine()
-        structured = engine.format_structured(rasi, nav, calc.metadata())
+        structured = engine.format_structured(rasi, nav, meta)
 
         # Merge heuristic yogas/dasas into the structured payload so LLM sees them
         structured["yogas"] = analysis_yogas.get("yogas", [])
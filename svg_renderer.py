@@ -5,6 +5,8 @@ Redirects to new chart renderers in charts.north_renderer and charts.south_rende
 Keep this file while you update other code; remove after cleanup.
 """
 
+from xml.sax.saxutils import escape
+
 from charts.north_renderer import draw_north_chart_svg
 from charts.south_renderer import draw_south_chart_svg
 
@@ -25,13 +27,17 @@ def render_navamsa_svg(nav_obj, **kwargs):
         from charts.nav_renderer import draw_navamsa_svg
         return draw_navamsa_svg(nav_obj, **kwargs)
     except Exception:
-        # simple fallback
-        import svgwrite
+        # simple fallback: one f-string per line, joined once (no svgwrite DOM)
         size = kwargs.get('size', 420)
-        dwg = svgwrite.Drawing(size=(size, size))
-        dwg.add(dwg.rect((0,0),(size,size), fill="#ffffff"))
         x, y = 12, 20
-        dwg.add(dwg.text("Navamsa", insert=(x,y)))
-        for i,(p,info) in enumerate(sorted(nav_obj.get('navamsa', {}).items())):
-            dwg.add(dwg.text(f"{p}: {info.get('nav_sign')}", insert=(x, y + (i+1)*18)))
-        return dwg.tostring()
+        parts = [
+            f'<svg baseProfile="full" height="{size}" version="1.1" width="{size}" xmlns="http://www.w3.org/2000/svg">',
+            f'<rect fill="#ffffff" height="{size}" width="{size}" x="0" y="0" />',
+            f'<text x="{x}" y="{y}">Navamsa</text>',
+        ]
+        parts += [
+            f'<text x="{x}" y="{y + (i+1)*18}">{escape(str(p))}: {escape(str(info.get("nav_sign")))}</text>'
+            for i, (p, info) in enumerate(sorted(nav_obj.get('navamsa', {}).items()))
+        ]
+        parts.append('</svg>')
+        return "".join(parts)
@@ -1,24 +1,63 @@
 # utils.py
+import os
+import re
+import shelve
+import threading
+from functools import lru_cache
 from geopy.geocoders import Nominatim
-import pytz
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
-def geocode_place(place: str):
-    # allow lat,lon direct
+# persistent geocode cache (shelve), keyed by the normalized place string
+GEOCODE_CACHE_PATH = os.getenv("ASTRO_GEOCODE_CACHE", "geocode.db")
+_geocode_lock = threading.Lock()
+# "lat,lon" (optionally followed by more comma-separated parts)
+_LATLON_RE = re.compile(r"^\s*(-?(?:\d+(?:\.\d*)?|\.\d+))\s*,\s*(-?(?:\d+(?:\.\d*)?|\.\d+))\s*(?:,.*)?$")
+
+def _normalize_place(place: str):
+    return " ".join(place.lower().split())
+
+def _geocode_store(key, value=None):
+    """Read (value=None) or write the persistent cache; errors are ignored."""
     try:
-        parts = [p.strip() for p in place.split(",")]
-        if len(parts) >= 2 and all([p.replace(".","",1).replace("-","",1).isdigit() for p in parts[:2]]):
-            return {"lat": float(parts[0]), "lon": float(parts[1])}
+        with _geocode_lock, shelve.open(GEOCODE_CACHE_PATH) as db:
+            if value is None:
+                return db.get(key)
+            db[key] = value
     except Exception:
-        pass
+        return None
+
+@lru_cache(maxsize=10_000)
+def _geocode_normalized(key: str):
+    """Geocode a normalized place; raises LookupError on a miss so failures aren't memoized."""
+    hit = _geocode_store(key)
+    if hit:
+        return hit
     geolocator = Nominatim(user_agent="sahadedv-geocoder")
     try:
-        loc = geolocator.geocode(place, timeout=10)
-        if loc:
-            return {"lat": loc.latitude, "lon": loc.longitude}
+        loc = geolocator.geocode(key, timeout=10)
     except Exception:
+        loc = None
+    if not loc:
+        raise LookupError(key)
+    result = {"lat": loc.latitude, "lon": loc.longitude}
+    _geocode_store(key, result)
+    return result
+
+def geocode_place(place: str):
+    # allow lat,lon direct
+    m = _LATLON_RE.match(place)
+    if m:
+        return {"lat": float(m.group(1)), "lon": float(m.group(2))}
+    try:
+        # copy so callers can't mutate the cached entry
+        return dict(_geocode_normalized(_normalize_place(place)))
+    except LookupError:
         return None
 
+@lru_cache(maxsize=64)
+def _zi(name: str):
+    return ZoneInfo(name)
+
 def ensure_tzaware(dt_naive: datetime, tz_name: str):
-    tz = pytz.timezone(tz_name)
-    return tz.localize(dt_naive)
+    return dt_naive.replace(tzinfo=_zi(tz_name))
@@ -7,11 +7,16 @@ Note: These are heuristics and meant for quick UI feedback. For production, use
 """
 
 from datetime import datetime, timedelta
+from itertools import accumulate
 import math
 
 # Vimshottari sequence & durations (years)
 VIM_ORDER = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
 VIM_YEARS = {'Ketu':7, 'Venus':20, 'Sun':6, 'Moon':10, 'Mars':7, 'Rahu':18, 'Jupiter':16, 'Saturn':19, 'Mercury':17}
+# durations in VIM_ORDER order (plain ints: at 9 entries a tuple beats an ndarray)
+VIM_YEARS_ARR = tuple(VIM_YEARS[lord] for lord in VIM_ORDER)
+# number of mahadashas listed in the sequence (current + next six)
+_VIM_SEQUENCE_LEN = 7
 
 def _deg_to_nak_index(lon):
     """
@@ -24,6 +29,22 @@ def _deg_to_nak_index(lon):
     fraction = (lon % span) / span
     return idx, fraction
 
+def _vim_core(moon_lon, years):
+    """
+    Numeric Vimshottari core: returns (start_index into VIM_ORDER, remaining years
+    of the current mahadasha, durations of the next _VIM_SEQUENCE_LEN mahadashas).
+    durations[0] is the remaining part of the current one.
+    """
+    nak_idx, frac = _deg_to_nak_index(moon_lon)
+    n = len(years)
+    # starting lord is based on nak index mapping repeating VIM_ORDER across 27 nakshatras
+    start_index = nak_idx % n
+    # remaining fraction of the mahadasha at birth = 1 - frac (because dasha runs from start of nak)
+    remaining_years = years[start_index] * (1.0 - frac)
+    durations = [remaining_years]
+    durations.extend(years[(start_index + i) % n] for i in range(1, _VIM_SEQUENCE_LEN))
+    return start_index, remaining_years, durations
+
 def compute_vimshottari_dasa_heuristic(moon_lon, birth_dt=None):
     """
     Compute a simple Vimshottari Mahadasha timeline starting from birth.
@@ -32,41 +53,23 @@ def compute_vimshottari_dasa_heuristic(moon_lon, birth_dt=None):
     Returns a dict with 'current' mahadasha name, remaining years (float),
     and a short upcoming list of mahadashas with start/end years (approx).
     """
-    nak_idx, frac = _deg_to_nak_index(moon_lon)
-    # starting lord is based on nak index mapping repeating VIM_ORDER across 27 nakshatras
-    start_lord = VIM_ORDER[nak_idx % len(VIM_ORDER)]
-    # remaining fraction of the mahadasha at birth = 1 - frac (because dasha runs from start of nak)
-    remaining_fraction = 1.0 - frac
-    # compute remaining years of current mahadasha
-    full_years = VIM_YEARS[start_lord]
-    remaining_years = full_years * remaining_fraction
-
-    # Build upcoming mahadasha sequence (names + durations)
-    sequence = []
-    # find index in order
-    start_index = VIM_ORDER.index(start_lord)
+    start_index, remaining_years, durations = _vim_core(float(moon_lon), VIM_YEARS_ARR)
+    start_lord = VIM_ORDER[start_index]
+
     # Use birth_dt if provided, else compute relative years
     if birth_dt is None:
         birth_dt = datetime.utcnow()
-        use_dates = False
-    else:
-        use_dates = True
-
-    cur_start = birth_dt
-    # current mahadasha started earlier; compute its end
-    cur_end = cur_start + timedelta(days=remaining_years * 365.25)
-    sequence.append({"name": start_lord, "start": cur_start.isoformat(), "end": cur_end.isoformat(), "duration_years": remaining_years})
-
-    # next mahadashas (cover next ~6)
-    idx = (start_index + 1) % len(VIM_ORDER)
-    running_start = cur_end
-    for i in range(1, 7):
-        lord = VIM_ORDER[idx]
-        dur = VIM_YEARS[lord]
-        running_end = running_start + timedelta(days=dur * 365.25)
-        sequence.append({"name": lord, "start": running_start.isoformat(), "end": running_end.isoformat(), "duration_years": dur})
-        running_start = running_end
-        idx = (idx + 1) % len(VIM_ORDER)
+
+    # Build upcoming mahadasha sequence (names + durations); first entry is the
+    # current mahadasha from birth, then the next six
+    # start/end offsets (in years) from a running sum, converted to ISO strings once
+    stamps = [(birth_dt + timedelta(days=off * 365.25)).isoformat()
+              for off in accumulate(durations, initial=0)]
+    n = len(VIM_ORDER)
+    sequence = [
+        {"name": VIM_ORDER[(start_index + i) % n], "start": stamps[i], "end": stamps[i + 1], "duration_years": dur}
+        for i, dur in enumerate(durations)
+    ]
 
     return {
         "current": f"{start_lord} Mahadasha (approx)",
@@ -80,54 +83,76 @@ def _angle_distance(a, b):
     d = abs((a - b + 180) % 360 - 180)
     return d
 
+# Sign groups (1-based rasi numbers) and the lords checked for Raja-yoga, in reporting order
+_KENDRA_SIGNS = frozenset((1, 4, 7, 10))
+_TRIKONA_SIGNS = frozenset((1, 5, 9))
+_RAJA_LORDS = ("Sun","Moon","Mercury","Venus","Jupiter","Mars","Saturn")
+
 def detect_common_yogas(rasi):
     """
     Conservative, readable heuristics for a few classical yogas.
     Returns a list of strings (yoga names). Avoids overclaiming.
     """
-    out = []
     p = rasi.get("planets", {})
+    kendra, trikona, raja_lords = _KENDRA_SIGNS, _TRIKONA_SIGNS, _RAJA_LORDS
+
+    # one pass over the planets: collect the features every rule needs
+    jup_lon = moon_lon = mars_lon = v_sign = None
+    in_kendra = set()
+    weak = []
+    for name, info in p.items():
+        lon = info.get("lon")
+        sign = info.get("rasi")
+        if name == "Jupiter":
+            jup_lon = lon
+        elif name == "Moon":
+            moon_lon = lon
+        elif name == "Mars":
+            mars_lon = lon
+        elif name == "Venus":
+            v_sign = sign
+        if sign in kendra and name in raja_lords:
+            in_kendra.add(name)
+        # weak placement: very early degrees in a sign
+        deg = info.get("degree_in_sign") or ((lon or 0) % 30)
+        if deg is not None and deg < 2.0:
+            weak.append((name, deg))
+
+    out = []
+    seen = set()
+
+    def emit(label):
+        # dedupe as matches are produced
+        if label not in seen:
+            seen.add(label)
+            out.append(label)
 
     # Gajakesari: strong Jupiter-Moon relationship (conjunction or trine within orb)
-    if "Jupiter" in p and "Moon" in p:
-        d = _angle_distance(p["Jupiter"]["lon"], p["Moon"]["lon"])
+    if jup_lon is not None and moon_lon is not None:
+        d = abs((jup_lon - moon_lon + 180) % 360 - 180)
         if d <= 6 or abs(d - 120) <= 6 or abs(d - 240) <= 6:
-            out.append("Gajakesari Yoga (heuristic)")
+            emit("Gajakesari Yoga (heuristic)")
 
     # Chandra-Mangal: Moon-Mars close conjunction or strong aspect
-    if "Moon" in p and "Mars" in p:
-        d = _angle_distance(p["Moon"]["lon"], p["Mars"]["lon"])
-        if d <= 3:
-            out.append("Chandra-Mangal Yoga (heuristic)")
+    if moon_lon is not None and mars_lon is not None:
+        if abs((moon_lon - mars_lon + 180) % 360 - 180) <= 3:
+            emit("Chandra-Mangal Yoga (heuristic)")
 
     # Mahalakshmi heuristic: Venus in trikona (1,5,9) plus benefic placements (simple)
-    if "Venus" in p:
-        v_sign = p["Venus"].get("rasi")
-        if v_sign in (1,5,9):
-            out.append("Mahalakshmi Yoga (heuristic)")
+    if v_sign in trikona:
+        emit("Mahalakshmi Yoga (heuristic)")
 
     # Raja-yoga family (simple): strong lords in kendras/trikonas
-    for lord in ("Sun","Moon","Mercury","Venus","Jupiter","Mars","Saturn"):
-        if lord in p:
-            s = p[lord].get("rasi")
-            if s in (1,4,7,10):  # kendra
-                out.append(f"Possible Raja-yoga influence ({lord} in kendra)")
+    for lord in raja_lords:
+        if lord in in_kendra:
+            emit(f"Possible Raja-yoga influence ({lord} in kendra)")
 
     # Neechabhanga (simple): planet debilitated but with cancellation by exalted trine/associate
     # We'll only provide a very safe placeholder detection: if a planet is <5 deg in a sign (debilitation)
-    for name,info in p.items():
-        deg = info.get("degree_in_sign") or (info.get("lon",0) % 30)
-        if deg is not None and deg < 2.0:
-            out.append(f"Possible Neecha (weak) placement: {name} (~{deg:.2f}°) — may require detailed inspection")
+    for name, deg in weak:
+        emit(f"Possible Neecha (weak) placement: {name} (~{deg:.2f}°) — may require detailed inspection")
 
-    # dedupe
-    seen = set()
-    filtered = []
-    for s in out:
-        if s not in seen:
-            filtered.append(s)
-            seen.add(s)
-    return filtered
+    return out
 
 def analyze_chart_for_yogas_and_dasas(rasi, nav=None, birth_dt=None):
     """